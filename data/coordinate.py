@@ -1,8 +1,11 @@
 # File containing the definition of coordinate class so put both lat and longitude in the axis coordinate
 # for the tensor
 
+from functools import total_ordering
+
 import numpy as np
 
+@total_ordering
 class Coordinate:
     '''
     Class that holds both the latitude and longitude data
@@ -12,19 +15,39 @@ class Coordinate:
     
     Sorts based on latitude since the latitude and longitude
     are directly correlated, when you bound one you bound the other.
+    The cantor value is only a combined lat/lon key, it is not what
+    comparisons or sort_coordinates order by.
     '''
     
+    __slots__ = ('lat', 'lon', 'cantor')
+    
     def __init__(self, latitude, longitude):
         self.lat = latitude
         self.lon = longitude
-        self.cantor = self.cantor()
-        return
+        self.cantor = self._cantor()
     
     
-    def cantor(self):
+    def _cantor(self):
         a, b = self.lat + 90, (self.lon + 180)/361
         return a + b
     
+    @classmethod
+    def from_arrays(cls, latitudes, longitudes):
+        '''
+        Makes a list of Coordinates from arrays of latitude and longitude,
+        working out all the cantor values in one numpy expression instead
+        of one at a time in __init__.
+        '''
+        latitudes, longitudes = np.asarray(latitudes), np.asarray(longitudes)
+        cantors = latitudes + 90 + (longitudes + 180)/361
+    
+        coordinates = []
+        for lat, lon, cantor in zip(latitudes.tolist(), longitudes.tolist(), cantors.tolist()):
+            coordinate = cls.__new__(cls)
+            coordinate.lat, coordinate.lon, coordinate.cantor = lat, lon, cantor
+            coordinates.append(coordinate)
+        return coordinates
+    
     def __repr__(self):
         return f'Cordinate pair at ({self.lat}, {self.lon}) cantor = {self.cantor}'
     
@@ -33,21 +56,73 @@ class Coordinate:
             return self.lat == other.lat and self.lon == other.lon
         if isinstance(other, int):
             return self.lat == other
+        return NotImplemented
         
     def __lt__(self, other):
         if isinstance(other, Coordinate):
             return self.lat < other.lat
         if isinstance(other, int):
             return self.lat < other
-            
-    def __le__(self, other):
-        if isinstance(other, Coordinate):
-            return self < other or self == other
-        if isinstance(other, int):
-            return self.lat <= other
+        return NotImplemented
         
     def __float__(self):
         return float(self.lat)
     
     def __array__(self):
-        return np.array([self.lat])
\ No newline at end of file
+        return np.array([self.lat])
+
+
+class CoordinateArray:
+    '''
+    Struct of arrays version of Coordinate for when there is a whole
+    track of coordinates at once. Holds latitude, longitude, and the cantor
+    value as three parallel numpy arrays instead of one object per point.
+    
+    Indexing with an integer gives back a regular Coordinate, anything else
+    (slices, masks, index arrays) gives back another CoordinateArray.
+    '''
+    
+    __slots__ = ('lat', 'lon', 'cantor')
+    
+    def __init__(self, latitude, longitude):
+        self.lat = np.asarray(latitude, dtype=np.float32)
+        self.lon = np.asarray(longitude, dtype=np.float32)
+        self.cantor = self.lat + 90 + (self.lon + 180)/361
+    
+    def __len__(self):
+        return self.lat.size
+    
+    def __repr__(self):
+        return f'CoordinateArray of {len(self)} coordinate pairs'
+    
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            # Filled straight from the stored arrays so the cantor matches self.cantor[index]
+            coordinate = Coordinate.__new__(Coordinate)
+            coordinate.lat, coordinate.lon, coordinate.cantor = self.lat[index], self.lon[index], self.cantor[index]
+            return coordinate
+        return CoordinateArray(self.lat[index], self.lon[index])
+    
+    def argsort(self):
+        '''
+        Indices that sort the coordinates by latitude, same order sorted() gives
+        a list of Coordinates.
+        '''
+        return np.argsort(self.lat, kind='stable')
+    
+    def to_coordinates(self):
+        '''
+        List of Coordinate objects for every pair in the array.
+        '''
+        return Coordinate.from_arrays(self.lat, self.lon)
+
+
+def sort_coordinates(coordinates):
+    '''
+    Sorts a list of Coordinates with a numpy argsort on the latitudes rather
+    than letting sorted() call __lt__ for every comparison. Gives the same
+    order as sorted(coordinates).
+    '''
+    keys = np.fromiter((coordinate.lat for coordinate in coordinates), dtype=np.float64, count=len(coordinates))
+    order = np.argsort(keys, kind='stable')
+    return [coordinates[i] for i in order]
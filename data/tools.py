@@ -1,7 +1,8 @@
 # Imports
+import functools
+
 import netCDF4 as nc
 import numpy as np
-import numpy.ma as ma
 import xarray as xr
 
 from calipso.data.coordinate import Coordinate
@@ -20,9 +21,21 @@ def valid_range_finder(datasetvariable):
         Example (0, 1.25)
     '''
     range_string = datasetvariable.valid_range
+    if not isinstance(range_string, str):
+        raise Exception('Valid Range is only a single value, please implement')
+    
+    return _parse_valid_range(range_string)
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_valid_range(range_string):
+    '''
+    Does the actual string parsing for valid_range_finder. Cached on the string
+    since every file of the same product has the same handful of ranges.
+    '''
     try:
         low, high = map(float, range_string.split('...'))
-    except:
+    except ValueError:
         raise Exception('Valid Range is only a single value, please implement')
     
     return low, high
@@ -33,14 +46,41 @@ def select_data(filename, var_name='Extinction_Coefficient_532'):
     Function that is given an hdf file path and variable of interest.
     Defaults to Extinction data
     """
-    dataset = nc.Dataset(filename)
+    with nc.Dataset(filename) as dataset:
+        return _select_variable(dataset, var_name)
+
+
+def _select_variable(dataset, var_name):
+    """
+    Same as select_data but for an already opened dataset so several
+    variables can be pulled out of one file without reopening it.
+    Values outside the valid range are set to NaN.
+    """
     variable = dataset[var_name]
     variable.set_auto_maskandscale(False)
-    variable_data = ma.masked_outside(variable, *valid_range_finder(variable))
+    low, high = valid_range_finder(variable)
+    
+    # variable[:] hands back a fresh array so the NaNs can go straight into it,
+    # only integer data needs converting to a float type first
+    raw = variable[:]
+    variable_data = np.asarray(raw, dtype=np.result_type(raw.dtype, np.float32))
+    variable_data[(variable_data < low) | (variable_data > high)] = np.nan
     
     return variable_data
 
 
+def _select_lazy_variable(dataset, var_name):
+    """
+    Version of _select_variable for an xarray dataset opened with chunks.
+    Masks values outside the valid range to NaN without loading anything.
+    """
+    variable = dataset[var_name]
+    low, high = valid_range_finder(variable)
+    
+    return variable.where((variable >= low) & (variable <= high))
+
+
+@functools.lru_cache(maxsize=1)
 def make_altitudes():
     '''
     Convenience function for making the array of altitudes for Calypso data.
@@ -59,38 +99,46 @@ def make_altitudes():
     Here, Level 2 (L2) products of CALIOP’s version 3 during the daytime were
     used from 2007 to 2015 in the present study.
     '''
-    alt = 0
-    alts = [alt]
-    step = 0
-    
-    while len(alts) < 399:
-        if 0 <= alt < 8.2:
-            step = 0.06
-        elif 8.2 <= alt < 20.2:
-            step = 0.06
-        else:
-            step = 0.18
-        
-        alt += step
-        alts.append(alt)
+    # The vertical resolution is 60 m up to 20.2 km and 180 m above that,
+    # so the grid is just the cumulative sum of two runs of constant steps
+    n_fine = int(np.ceil(20.2 / 0.06)) # Number of 60 m steps taken before crossing 20.2 km
+    steps = np.concatenate(([0.0], np.full(n_fine, 0.06), np.full(398 - n_fine, 0.18)))
+    alts = np.cumsum(steps)
     
     # The altitudes in the extinction array is expecting the highest first so I flip my array
-    return np.flip(np.array(alts))
+    alts = alts[::-1].copy()
+    alts.flags.writeable = False # Cached and shared between tensors so nobody gets to change it
+    return alts
 
 
-def create_extinction_tensor(filename):
+def create_extinction_tensor(filename, chunks=None):
     '''
     Makes a tensor of extinction coefficients given a data file via path of filename.
     The tensor is an xarray of dimension latitude x altitude.
     
+    If chunks is given (anything xr.open_dataset takes, like 'auto' or
+    {'fakeDim0': 4096}) the extinction data is backed by a dask array and only
+    read and masked in chunks as it is needed, otherwise it is all read in at once.
+    Either way values outside the valid range are NaN.
+    
     Returns
     -------
     xarray : dims [ 'lat', 'alt' ]
     '''
     
-    extinction_data = select_data(filename)
-    latitude = select_data(filename, 'Latitude')[:, 0]
-    longitude = select_data(filename, 'Longitude')[:, 0]
+    # Latitude and longitude are kept as float32, still well under a meter of precision,
+    # and copying them out of the [:, 0] column leaves a compact array for the index
+    if chunks is not None:
+        dataset = xr.open_dataset(filename, engine='netcdf4', chunks=chunks, mask_and_scale=False)
+        extinction_data = _select_lazy_variable(dataset, 'Extinction_Coefficient_532').data
+        latitude = _select_lazy_variable(dataset, 'Latitude')[:, 0].values.astype(np.float32)
+        longitude = _select_lazy_variable(dataset, 'Longitude')[:, 0].values.astype(np.float32)
+    else:
+        with nc.Dataset(filename) as dataset:
+            extinction_data = _select_variable(dataset, 'Extinction_Coefficient_532')
+            latitude = _select_variable(dataset, 'Latitude')[:, 0].astype(np.float32)
+            longitude = _select_variable(dataset, 'Longitude')[:, 0].astype(np.float32)
+    
     altitudes = make_altitudes() # Makes the altitudes I think the documentation is telling me it makes
     
     data_tensor = xr.DataArray(extinction_data, dims=['lat', 'alt'], coords=[latitude, altitudes])
@@ -117,10 +165,18 @@ def filter_tensor(data_tensor, latitudes=(-90, 90), longitudes=False, altitudes=
     '''
 
     a, b = min(altitudes), max(altitudes) # The altitudes can be given in any order
-    sorted_alts = data_tensor.sortby(sortby).alt
-    altitudes_mask = [ a <= alt and alt <= b for alt in sorted_alts] # Boolean mask of where the altitude should be kept
+    if isinstance(sortby, str) and sortby in data_tensor.indexes and data_tensor.indexes[sortby].is_monotonic_increasing:
+        sorted_tensor = data_tensor # Already in order, sortby would only make a copy
+    else:
+        sorted_tensor = data_tensor.sortby(sortby)
+    sorted_alts = sorted_tensor.alt.values
+    altitudes_mask = (a <= sorted_alts) & (sorted_alts <= b) # Boolean mask of where the altitude should be kept
+    
+    # Turn the latitude bounds into positions once so the selection is plain integer indexing,
+    # slice_locs keeps the same inclusive bounds that .loc used
+    lat_start, lat_stop = sorted_tensor.indexes['lat'].slice_locs(*latitudes)
     
-    return data_tensor.sortby(sortby).loc[slice(*latitudes), altitudes_mask].transpose()
+    return sorted_tensor.isel(lat=slice(lat_start, lat_stop), alt=np.flatnonzero(altitudes_mask)).transpose()
 
 
 
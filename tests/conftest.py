@@ -0,0 +1,12 @@
+# Lets the tests import the checkout as the calipso package no matter
+# what the folder it was cloned into is called
+import sys
+import types
+from pathlib import Path
+
+try:
+    import calipso
+except ImportError:
+    calipso = types.ModuleType('calipso')
+    calipso.__path__ = [str(Path(__file__).resolve().parents[1])]
+    sys.modules['calipso'] = calipso
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from calipso.data.coordinate import Coordinate, CoordinateArray, sort_coordinates
+
+# Latitudes less than a degree apart with longitudes on opposite sides of the
+# globe, so ordering by cantor and ordering by latitude disagree
+LATITUDES = [10.5, 10.2, -3.0, 10.8, 10.2]
+LONGITUDES = [-179.0, 170.0, 0.0, -150.0, -170.0]
+
+
+@pytest.fixture
+def coordinates():
+    return [Coordinate(lat, lon) for lat, lon in zip(LATITUDES, LONGITUDES)]
+
+
+def test_cantor_order_is_not_latitude_order(coordinates):
+    by_cantor = sorted(coordinates, key=lambda coordinate: coordinate.cantor)
+    assert [c.lat for c in by_cantor] != sorted(LATITUDES)
+
+
+def test_sorted_orders_by_latitude(coordinates):
+    assert [c.lat for c in sorted(coordinates)] == sorted(LATITUDES)
+
+
+def test_sort_coordinates_matches_sorted(coordinates):
+    result = sort_coordinates(coordinates)
+    expected = sorted(coordinates)
+    
+    assert result == expected
+    assert all(a is b for a, b in zip(result, expected)) # Ties keep their original order too
+
+
+def test_coordinate_array_argsort_matches_sorted(coordinates):
+    order = CoordinateArray(LATITUDES, LONGITUDES).argsort()
+    expected = sorted(range(len(coordinates)), key=coordinates.__getitem__)
+    
+    np.testing.assert_array_equal(order, expected)
+
+
+def test_comparisons_with_coordinates():
+    low, high = Coordinate(10.2, 170.0), Coordinate(10.5, -179.0)
+    same = Coordinate(10.2, 170.0)
+    
+    assert low < high and low <= high and not low > high and not low >= high
+    assert high > low and high >= low
+    assert low <= same and low >= same and not low < same and not low > same
+
+
+def test_comparisons_with_ints():
+    coordinate = Coordinate(10.0, 45.0)
+    
+    assert coordinate == 10
+    assert coordinate <= 10 and coordinate >= 10
+    assert coordinate < 11 and coordinate <= 11 and not coordinate >= 11
+    assert coordinate > 9 and coordinate >= 9 and not coordinate <= 9
+
+
+@pytest.mark.parametrize('compare', [
+    lambda coordinate: coordinate < 10.5,
+    lambda coordinate: coordinate <= 10.5,
+    lambda coordinate: coordinate > 10.5,
+    lambda coordinate: coordinate >= 10.5,
+])
+def test_comparisons_with_floats_raise(compare):
+    with pytest.raises(TypeError):
+        compare(Coordinate(10.0, 45.0))
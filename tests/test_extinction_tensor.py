@@ -0,0 +1,52 @@
+import netCDF4 as nc
+import numpy as np
+import pytest
+
+from calipso.data.tools import create_extinction_tensor, filter_tensor
+
+
+@pytest.fixture
+def calipso_file(tmp_path):
+    '''
+    Small stand in for a CALIPSO L2 profile file with the same variable names,
+    shapes, and string valid_range attributes. Some values are out of range.
+    '''
+    filename = tmp_path / 'CAL_LID_L2_test.hdf'
+    with nc.Dataset(filename, 'w') as dataset:
+        dataset.createDimension('fakeDim0', 6)
+        dataset.createDimension('fakeDim1', 399)
+        dataset.createDimension('fakeDim2', 3)
+        
+        extinction = dataset.createVariable('Extinction_Coefficient_532', 'f4', ('fakeDim0', 'fakeDim1'))
+        extinction.setncattr('valid_range', '0.0...1.25')
+        extinction[:] = np.linspace(-1, 2, 6*399).reshape(6, 399)
+        
+        for name, values in [('Latitude', [3.5, 1.25, 2.0, 5.0, 4.75, -200.0]),
+                             ('Longitude', [10.0, 20.0, 30.0, 40.0, 50.0, 60.0])]:
+            variable = dataset.createVariable(name, 'f4', ('fakeDim0', 'fakeDim2'))
+            variable.setncattr('valid_range', '-180.0...180.0')
+            variable[:] = np.repeat(np.array(values)[:, None], 3, axis=1)
+    
+    return filename
+
+
+def test_chunked_matches_eager(calipso_file):
+    pytest.importorskip('dask')
+    
+    eager = create_extinction_tensor(calipso_file)
+    chunked = create_extinction_tensor(calipso_file, chunks={'fakeDim0': 2})
+    
+    assert chunked.chunks is not None
+    assert np.isnan(eager.values).any()
+    np.testing.assert_array_equal(chunked.values, eager.values)
+    np.testing.assert_array_equal(chunked.lat.values, eager.lat.values)
+    np.testing.assert_array_equal(chunked.alt.values, eager.alt.values)
+
+
+def test_filter_tensor_sorts_by_non_index_coordinate(calipso_file):
+    data_tensor = create_extinction_tensor(calipso_file)
+    data_tensor = data_tensor.assign_coords(lon=('lat', data_tensor.lat.attrs['lon']))
+    
+    filtered = filter_tensor(data_tensor.sortby('lat'), latitudes=(3.5, 5.0), sortby='lon')
+    
+    np.testing.assert_array_equal(filtered.lon.values, [10, 20, 30, 40])